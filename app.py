@@ -1,8 +1,140 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import io
+import altair as alt
+import math
+from functools import lru_cache
+from collections import namedtuple
+from dataclasses import dataclass
 from datetime import date
+from types import SimpleNamespace
+
+# Static process diagrams
+SCHEMATIC = """
+Raw Wastewater → pH Adjustment (to 9.5) → AOP Reactor Trains → Sand Filtration → pH Adjustment (to 7.0) → Treated Effluent
+                                            |       ↑
+                                            v       |
+                                        Each train: |
+                                        [AOP 1] → [AOP 2] → ... → [AOP n]
+                                            ↑_______|_______↓
+                                                Recirculation
+"""
+
+PUMP_DIAGRAM = """
+Influent Storage → [Influent Pumps] → AOP Reactor Trains → [Effluent Pumps] → Effluent Storage
+                                           ↑       ↓
+                                    [Recirculation Pumps]
+"""
+
+# Static notes shown in info boxes
+CONTAINER_HOUSING_NOTE = """
+Container housing information:
+- Each 20ft container costs $6,000 and can house up to 6 equipment units (reactors or filters)
+- Each 40ft container costs $7,000 and can house up to 12 equipment units (reactors or filters)
+- For flowrates ≤15 m³/day, 20ft containers are used
+- For flowrates >15 m³/day, 40ft containers are used primarily
+- Additional equipment is housed in either 20ft or 40ft containers based on the count
+"""
+
+PUMP_CONFIGURATION_NOTE = """
+**Pump Configuration:**
+- Each conveyance requires 1 running and 1 standby configuration.
+- Influent pumps fill the first reactors in each train simultaneously in 15 minutes.
+- Effluent pumps drain the last reactors in each train simultaneously in 15 minutes.
+- Recirculation pumps continuously recirculate AOP reactor volumes.
+"""
+
+RECIRCULATION_NOTE = """
+The recirculation pump train handles the continuous recirculation of AOP reactor volumes
+to ensure optimal treatment efficiency and mixing.
+"""
+
+FILTRATION_NOTE = """
+**Sand Filtration System:**
+- Sand filtration follows the AOP process to remove any remaining particulates.
+- Sizing is based on the total flow rate from all AOP reactor trains.
+"""
+
+PH_ADJUSTMENT_NOTE = """
+**pH Adjustment Process:**
+1. Inlet pH needs to be raised to 9.5 before the first AOP reactor
+2. pH needs to be neutralized back to 7.0 after sand filtration
+"""
+
+PH_SYSTEM_COMPONENTS_NOTE = """
+- Chemical storage tanks with secondary containment
+- Chemical dosing pumps with flow-paced control
+- Inline pH monitoring equipment
+- Mixing systems at injection points
+- Safety equipment for chemical handling
+"""
+
+# Notes and assumptions listed under the full design summary
+DESIGN_ASSUMPTIONS_NOTE = """
+1. COD reduction per stage is assumed to be 60% (remaining COD is 40% of original).
+2. Ozone requirement is calculated at 0.25g O3 per 1g COD.
+3. Each AOP reactor is equipped with 2 ozone generators (200g O3/hour each).
+4. Each reactor train has a minimum of 2 and maximum of 4 reactors in series.
+5. Pump sizing assumes 15-minute fill/drain time for each reactor.
+6. The design includes 100% standby capacity for all pumps.
+7. Recirculation pumps continuously circulate water through the AOP reactors at a rate of 5× the total reactor volume every 2 hours.
+8. Filtration design uses standard loading rates for sand filtration.
+9. pH adjustment systems are sized based on typical chemical dosing requirements.
+"""
+
+# Notes column of the detailed cost CSV for the CAPEX items, Total CAPEX and the OPEX items
+COST_ITEM_NOTES = (
+    "AOP reactor cost", "Ozone generator cost", "Pumping equipment cost",
+    "Sand filtration system", "pH adjustment system", "Container Housing",
+    "Piping and instrumentation", "Engineering, procurement, and construction",
+    "Total capital expenditure",
+    "Power for ozone generation", "Power for pumping", "Chemical costs for pH adjustment",
+    "Staff costs", "Parts and consumables",
+)
+
+# All inputs to the design calculation. Frozen so it is hashable and can key the
+# st.cache_data entry as a single argument; factors are stored as decimals.
+@dataclass(frozen=True, slots=True)
+class Params:
+    flowrate: float
+    cod_inlet: float
+    cod_target: float
+    initial_ph: float
+    reactor_size: float
+    php_conversion_rate: float
+    electricity_cost: float
+    chemical_cost_factor: float
+    aop_reactor_unit_cost: float
+    pump_unit_cost: float
+    filter_unit_cost: float
+    ph_adjustment_unit_cost: float
+    ozone_generator_unit_cost: float
+    operator_monthly_salary: float
+    ozone_power_consumption: float
+    pump_power_consumption: float
+    chemicals_base_cost: float
+    maintenance_factor: float
+    piping_factor: float
+    epc_factor: float
+    container_20ft_cost: float
+    container_40ft_cost: float
+
+# Fixed design assumptions (not user-adjustable). Defined once at import instead of as
+# literals scattered through the calculation and the views.
+@dataclass(frozen=True, slots=True)
+class DesignConstants:
+    cod_remaining_per_stage: float = 0.40  # each AOP stage removes 60% of the COD
+    ozone_dose: float = 0.25  # g O3 per g COD
+    ozone_generator_capacity: int = 200  # g/hour
+    reactor_fill_hours: float = 0.25  # reactors fill/drain in 15 minutes
+    filtration_loading_rate: int = 10  # m³/m²/hour
+    container_20ft_capacity: int = 6  # equipment units
+    container_40ft_capacity: int = 12  # equipment units
+    contingency_rate: float = 0.1  # of CAPEX
+    tax_rate: float = 0.12  # on CAPEX plus contingency
+    lifetime_capex_factor: float = 1.232  # CAPEX with contingency and tax, for lifetime cost
+
+DESIGN = DesignConstants()
 
 # Set page configuration
 st.set_page_config(
@@ -15,33 +147,86 @@ st.set_page_config(
 st.title("ECH2O AOP Design Dashboard")
 st.markdown("This dashboard calculates and summarizes the design specifications for a modular wastewater treatment process.")
 
+# Inputs that live on a single view (standard rates, years of operation) are keyed into session state
+# so their values survive reruns where that view, and therefore its widgets, is not rendered
+VIEW_INPUT_DEFAULTS = {
+    "aop_reactor_unit_cost": 650.0,
+    "pump_unit_cost": 650.0,
+    "filter_unit_cost": 650.0,
+    "ph_adjustment_unit_cost": 650.0,
+    "ozone_generator_unit_cost": 650.0,
+    "container_20ft_cost": 6000.0,
+    "container_40ft_cost": 7000.0,
+    "operator_monthly_salary": 450.0,
+    "ozone_power_consumption": 3.0,
+    "pump_power_consumption": 0.05,
+    "chemicals_base_cost": 0.25,
+    "maintenance_factor": 10.0,
+    "piping_factor": 30.0,
+    "epc_factor": 30.0,
+    "years_of_operation": 10
+}
+for key, default in VIEW_INPUT_DEFAULTS.items():
+    # Re-assigning on every run stops Streamlit from discarding the value of a widget that is not rendered
+    st.session_state[key] = st.session_state.get(key, default)
+rates = st.session_state
+
 # Sidebar for design parameters
-st.sidebar.header("Design Parameters")
-
-flowrate = st.sidebar.number_input("Flowrate (cubic meters per day)", min_value=10.0, value=10.0, step=5.0, max_value=150.0)
-cod_inlet = st.sidebar.number_input("COD Inlet (ppm)", min_value=10.0, value=1000.0, step=10.0)
-cod_target = st.sidebar.number_input("COD Target (ppm)", min_value=1.0, max_value=cod_inlet-1.0, value=min(75.0, cod_inlet-1.0), step=5.0)
-initial_ph = st.sidebar.number_input("Initial pH", min_value=1.0, max_value=14.0, value=7.0, step=0.1)
-reactor_size_options = {1.5: "1.5 cubic meters", 2.0: "2.0 cubic meters"}
-reactor_size = st.sidebar.selectbox(
-    "AOP Reactor Size", 
-    options=list(reactor_size_options.keys()),
-    format_func=lambda x: reactor_size_options[x]
-)
+def read_params(rates):
+    st.sidebar.header("Design Parameters")
+
+    flowrate = st.sidebar.number_input("Flowrate (cubic meters per day)", min_value=10.0, value=10.0, step=5.0, max_value=150.0)
+    cod_inlet = st.sidebar.number_input("COD Inlet (ppm)", min_value=10.0, value=1000.0, step=10.0)
+    cod_target = st.sidebar.number_input("COD Target (ppm)", min_value=1.0, max_value=cod_inlet-1.0, value=min(75.0, cod_inlet-1.0), step=5.0)
+    initial_ph = st.sidebar.number_input("Initial pH", min_value=1.0, max_value=14.0, value=7.0, step=0.1)
+    reactor_size_options = {1.5: "1.5 cubic meters", 2.0: "2.0 cubic meters"}
+    reactor_size = st.sidebar.selectbox(
+        "AOP Reactor Size", 
+        options=list(reactor_size_options.keys()),
+        format_func=lambda x: reactor_size_options[x]
+    )
+
+    # Add PHP conversion rate
+    php_conversion_rate = st.sidebar.number_input("USD to PHP Conversion Rate", min_value=40.0, max_value=80.0, value=58.0, step=0.1)
 
-# Add PHP conversion rate
-php_conversion_rate = st.sidebar.number_input("USD to PHP Conversion Rate", min_value=40.0, max_value=80.0, value=58.0, step=0.1)
+    # Create a separator in the sidebar
+    st.sidebar.markdown("---")
+    st.sidebar.header("Cost Parameters")
 
-# Create a separator in the sidebar
-st.sidebar.markdown("---")
-st.sidebar.header("Cost Parameters")
+    # Add sidebar section for electricity and chemical costs
+    electricity_cost = st.sidebar.number_input("Electricity Cost (USD/kWh)", min_value=0.05, max_value=0.5, value=0.19, step=0.01)
+    chemical_cost_factor = st.sidebar.number_input("Chemical Cost Factor (1.0 = standard)", min_value=0.5, max_value=2.0, value=1.0, step=0.1)
+    
+    return Params(
+        flowrate=flowrate,
+        cod_inlet=cod_inlet,
+        cod_target=cod_target,
+        initial_ph=initial_ph,
+        reactor_size=reactor_size,
+        php_conversion_rate=php_conversion_rate,
+        electricity_cost=electricity_cost,
+        chemical_cost_factor=chemical_cost_factor,
+        aop_reactor_unit_cost=rates["aop_reactor_unit_cost"],
+        pump_unit_cost=rates["pump_unit_cost"],
+        filter_unit_cost=rates["filter_unit_cost"],
+        ph_adjustment_unit_cost=rates["ph_adjustment_unit_cost"],
+        ozone_generator_unit_cost=rates["ozone_generator_unit_cost"],
+        operator_monthly_salary=rates["operator_monthly_salary"],
+        ozone_power_consumption=rates["ozone_power_consumption"],
+        pump_power_consumption=rates["pump_power_consumption"],
+        chemicals_base_cost=rates["chemicals_base_cost"],
+        maintenance_factor=rates["maintenance_factor"] / 100.0,  # Convert percentages to decimals
+        piping_factor=rates["piping_factor"] / 100.0,
+        epc_factor=rates["epc_factor"] / 100.0,
+        container_20ft_cost=rates["container_20ft_cost"],
+        container_40ft_cost=rates["container_40ft_cost"]
+    )
 
-# Add sidebar section for electricity and chemical costs
-electricity_cost = st.sidebar.number_input("Electricity Cost (USD/kWh)", min_value=0.05, max_value=0.5, value=0.19, step=0.01)
-chemical_cost_factor = st.sidebar.number_input("Chemical Cost Factor (1.0 = standard)", min_value=0.5, max_value=2.0, value=1.0, step=0.1)
+params = read_params(rates)
 
 # Main content
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+# Only the selected view is rendered on each rerun, so the other views' metrics and tables are not rebuilt
+TAB_NAMES = [
     "AOP Summary", 
     "Wastewater Conveyance", 
     "Filtration Requirements", 
@@ -49,312 +234,490 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
     "Standard Rates",
     "Full Design Summary",
     "CAPEX & OPEX"
+]
+active_tab = st.radio("View", TAB_NAMES, horizontal=True, label_visibility="collapsed")
+
+# Numeric outputs of the design calculation, in the order returned by design_core
+DesignCore = namedtuple("DesignCore", [
+    "cod_load_kg_per_day",
+    "ozone_requirement_kg_per_day",
+    "num_parallel_reactors_needed",
+    "stages_needed",
+    "num_reactor_trains",
+    "total_reactors",
+    "num_ozone_generators",
+    "ozone_generator_cost",
+    "cod_reduction_stages",
+    "pump_flow_rate_per_train",
+    "total_pump_flow_rate",
+    "recirculation_flow_rate",
+    "recirculation_pumps_required",
+    "total_influent_effluent_pumps",
+    "total_pumps",
+    "aop_reactor_cost",
+    "pump_cost",
+    "filter_cost",
+    "required_filter_area",
+    "filter_units",
+    "ph_adjustment_cost",
+    "piping_cost",
+    "epc_cost",
+    "total_capex",
+    "monthly_ozone_power_cost",
+    "daily_recirculation_energy",
+    "monthly_pumping_cost",
+    "monthly_chemical_cost",
+    "monthly_labor_cost",
+    "monthly_maintenance_cost",
+    "total_monthly_opex",
+    "operators_required",
+    "num_20ft_containers",
+    "num_40ft_containers",
+    "container_cost",
+    "total_equipment_units",
 ])
 
-# Calculate design values
-def calculate_design_values(aop_reactor_unit_cost, pump_unit_cost, filter_unit_cost, ph_adjustment_unit_cost, ozone_generator_unit_cost, operator_monthly_salary, ozone_power_consumption, pump_power_consumption, chemicals_base_cost, maintenance_factor, piping_factor, epc_factor, container_20ft_cost, container_40ft_cost):
+# 1 / ln(0.40): each stage leaves 40% of the COD, so the stage count needs only one log per call
+INV_LOG_COD_REMAINING = 1.0 / math.log(DESIGN.cod_remaining_per_stage)
+
+# COD after each AOP stage (60% reduction per stage), starting with the inlet COD
+def cod_reduction_stages(cod_inlet, cod_target):
+    # Smallest n with cod_inlet * 0.40**n <= cod_target (cod_target < cod_inlet is enforced by the sidebar)
+    stages_raw = math.ceil(math.log(cod_target / cod_inlet) * INV_LOG_COD_REMAINING)
+    return cod_inlet * np.power(DESIGN.cod_remaining_per_stage, np.arange(stages_raw + 1))
+
+# Core sizing and cost arithmetic: Params in, plain numbers out (no Streamlit calls, no dicts)
+def design_core(p):
     # Basic calculations
-    cod_load_kg_per_day = flowrate * cod_inlet / 1000  # kg/day
-    ozone_requirement_kg_per_day = 0.25 * cod_load_kg_per_day  # 0.25 g O3 per 1 g COD
+    cod_load_kg_per_day = p.flowrate * p.cod_inlet / 1000  # kg/day
+    ozone_requirement_kg_per_day = DESIGN.ozone_dose * cod_load_kg_per_day  # 0.25 g O3 per 1 g COD
     
     # AOP reactor calculations
-    reactor_volume_per_day = flowrate  # m³/day
+    reactor_volume_per_day = p.flowrate  # m³/day
     reactor_volume_per_hour = reactor_volume_per_day / 24  # m³/hour
     
     # Each reactor can process 1 reactor_size volume in 2 hours
-    hourly_processing_capacity_per_reactor = reactor_size / 2  # m³/hour
+    hourly_processing_capacity_per_reactor = p.reactor_size / 2  # m³/hour
     
-    # Number of reactors needed based on flow rate
-    num_parallel_reactors_needed = np.ceil(reactor_volume_per_hour / hourly_processing_capacity_per_reactor)
+    # Number of reactors needed based on flow rate (equipment counts are kept as ints throughout)
+    num_parallel_reactors_needed = math.ceil(reactor_volume_per_hour / hourly_processing_capacity_per_reactor)
     
     # Calculate ozone generators
     ozone_requirement_g_per_hour = ozone_requirement_kg_per_day * 1000 / 24  # g/hour
-    ozone_capacity_per_generator = 200  # g/hour
+    ozone_capacity_per_generator = DESIGN.ozone_generator_capacity  # g/hour
     ozone_capacity_per_reactor = 2 * ozone_capacity_per_generator  # 2 generators per reactor
     
     # Determine number of reactor trains
     # Calculate stage-wise COD reduction
-    current_cod = cod_inlet
-    stages_needed = 0
-    cod_values = [current_cod]
-    
-    while current_cod > cod_target:
-        current_cod = current_cod * 0.40  # 60% reduction
-        cod_values.append(current_cod)
-        stages_needed += 1
-    
+    cod_values = cod_reduction_stages(p.cod_inlet, p.cod_target)
+
     # Ensure min 2 reactors, max 4 reactors per train
-    stages_needed = max(2, min(4, stages_needed))
+    stages_needed = max(2, min(4, len(cod_values) - 1))
     
     # Number of reactor trains
-    num_reactor_trains = int(np.ceil(num_parallel_reactors_needed))
+    num_reactor_trains = num_parallel_reactors_needed
     
     # Total number of reactors
     total_reactors = num_reactor_trains * stages_needed
     
     # Ozone generator calculations
     num_ozone_generators = total_reactors * 2  # 2 generators per reactor
-    ozone_generator_cost = num_ozone_generators * ozone_generator_unit_cost  # Variable cost per generator
+    ozone_generator_cost = num_ozone_generators * p.ozone_generator_unit_cost  # Variable cost per generator
     
     # Pump calculations
-    pump_flow_rate_per_train = reactor_size / 0.25  # m³/hour (fill in 15 minutes = 0.25 hours)
+    pump_flow_rate_per_train = p.reactor_size / DESIGN.reactor_fill_hours  # m³/hour (fill in 15 minutes = 0.25 hours)
     total_pump_flow_rate = pump_flow_rate_per_train * num_reactor_trains  # m³/hour
     
     # Recirculation pump calculations
     # Rate of recirculation = # of AOP reactors × volume of reactors × 5 / 2 hrs
-    recirculation_flow_rate = total_reactors * reactor_size * 4 / 2  # m³/hour
+    recirculation_flow_rate = total_reactors * p.reactor_size * 4 / 2  # m³/hour
     recirculation_pumps_required = 2  # 1 running, 1 standby
     
     # CAPEX calculations
-    aop_reactor_cost = aop_reactor_unit_cost * total_reactors
+    aop_reactor_cost = p.aop_reactor_unit_cost * total_reactors
     
     total_influent_effluent_pumps = num_reactor_trains * 4  # 2 influent (1 running, 1 standby) + 2 effluent per train
     total_pumps = total_influent_effluent_pumps + recirculation_pumps_required
-    pump_cost = pump_unit_cost * total_pumps
+    pump_cost = p.pump_unit_cost * total_pumps
     
     # Sand filtration system cost
-    filtration_loading_rate = 10  # m³/m²/hour (typical value)
+    filtration_loading_rate = DESIGN.filtration_loading_rate  # m³/m²/hour (typical value)
     required_filter_area = total_pump_flow_rate / filtration_loading_rate
-    filter_units = max(2, int(np.ceil(required_filter_area/5)))
-    filter_cost = filter_unit_cost * required_filter_area
+    filter_units = max(2, math.ceil(required_filter_area/5))
+    filter_cost = p.filter_unit_cost * required_filter_area
     
     # pH adjustment systems
-    ph_adjustment_cost = ph_adjustment_unit_cost  # Variable cost for pH systems
+    ph_adjustment_cost = p.ph_adjustment_unit_cost  # Variable cost for pH systems
     
     # Container housing calculations
     total_equipment_units = total_reactors + filter_units
     
     # Container requirements based on flowrate and equipment count
-    container_20ft_capacity = 6  # units
-    container_40ft_capacity = 12  # units
+    container_20ft_capacity = DESIGN.container_20ft_capacity  # units
+    container_40ft_capacity = DESIGN.container_40ft_capacity  # units
     # Note: container costs now come from user input in tab5
     
-    if flowrate <= 15:
+    if p.flowrate <= 15:
         # Use 20ft container for flowrates up to 15 m³/day
-        num_20ft_containers = 1
-        num_40ft_containers = 0
+        num_20ft_containers, num_40ft_containers = 1, 0
     else:
-        # For flowrates > 15 m³/day, start with 40ft containers
-        if total_equipment_units <= container_40ft_capacity:
-            num_40ft_containers = 1
-            num_20ft_containers = 0
-        else:
-            # Need multiple containers
-            num_40ft_containers = total_equipment_units // container_40ft_capacity
-            remaining_units = total_equipment_units % container_40ft_capacity
-            
-            # Determine if we need additional 20ft or 40ft container
-            if remaining_units > 0:
-                if remaining_units <= container_20ft_capacity:
-                    num_20ft_containers = 1
-                else:
-                    num_40ft_containers += 1
-                    num_20ft_containers = 0
-            else:
-                num_20ft_containers = 0
-    
-    container_cost = (num_20ft_containers * container_20ft_cost) + (num_40ft_containers * container_40ft_cost)
+        # For flowrates > 15 m³/day, fill 40ft containers first
+        num_40ft_containers, remaining_units = divmod(total_equipment_units, container_40ft_capacity)
+        if num_40ft_containers == 0:
+            # Everything fits in a single 40ft container
+            num_40ft_containers, remaining_units = 1, 0
+        # Remaining units go in one 20ft container if they fit, otherwise one more 40ft container
+        num_20ft_containers = int(0 < remaining_units <= container_20ft_capacity)
+        num_40ft_containers += int(remaining_units > container_20ft_capacity)
+    
+    container_cost = (num_20ft_containers * p.container_20ft_cost) + (num_40ft_containers * p.container_40ft_cost)
     
     # Piping, instrumentation, and controls
-    piping_cost = (aop_reactor_cost + pump_cost) * piping_factor  # Using user-defined piping factor
+    piping_cost = (aop_reactor_cost + pump_cost) * p.piping_factor  # Using user-defined piping factor
     
     # Engineering, procurement, and construction (EPC)
     direct_costs = aop_reactor_cost + ozone_generator_cost + pump_cost + filter_cost + ph_adjustment_cost + piping_cost + container_cost
-    epc_cost = direct_costs * epc_factor  # Using user-defined EPC factor
+    epc_cost = direct_costs * p.epc_factor  # Using user-defined EPC factor
     
     # Total CAPEX
     total_capex = direct_costs + epc_cost
     
     # OPEX calculations (monthly)
     # Electricity for ozone generation
-    daily_ozone_energy = ozone_requirement_kg_per_day * ozone_power_consumption  # kWh/day
+    daily_ozone_energy = ozone_requirement_kg_per_day * p.ozone_power_consumption  # kWh/day
     monthly_ozone_energy = daily_ozone_energy * 30  # kWh/month
-    monthly_ozone_power_cost = monthly_ozone_energy * electricity_cost
     
     # Electricity for pumping (including recirculation)
-    daily_pumping_energy = flowrate * pump_power_consumption  # kWh/day
+    daily_pumping_energy = p.flowrate * p.pump_power_consumption  # kWh/day
     # Add recirculation energy (assume running 24 hours a day)
-    daily_recirculation_energy = recirculation_flow_rate * 24 * pump_power_consumption  # kWh/day
+    daily_recirculation_energy = recirculation_flow_rate * 24 * p.pump_power_consumption  # kWh/day
     total_daily_pumping_energy = daily_pumping_energy + daily_recirculation_energy
     monthly_pumping_energy = total_daily_pumping_energy * 30  # kWh/month
-    monthly_pumping_cost = monthly_pumping_energy * electricity_cost
-    
-    # Chemical costs for pH adjustment
-    monthly_chemical_cost = (flowrate * 30) * chemicals_base_cost * chemical_cost_factor
     
     # Labor costs
-    operators_required = max(1, int(np.ceil(total_reactors / 8)))  # Minimum 2 operators
-    monthly_labor_cost = operators_required * operator_monthly_salary
+    operators_required = max(1, -(-total_reactors // 8))  # Minimum 2 operators
     
-    # Maintenance costs (parts, consumables)
-    monthly_maintenance_cost = total_capex * maintenance_factor / 12  # Maintenance factor % of CAPEX per year
+    # Monthly OPEX components as base quantity x unit cost, in one vectorized multiply:
+    # ozone power, pumping power, chemicals at the base cost x cost factor, labor, and
+    # maintenance (% of CAPEX per year, already a cost). The bases keep the original
+    # operation order so the components match the scalar formulas bit for bit.
+    opex_bases = np.array([monthly_ozone_energy, monthly_pumping_energy, p.flowrate * 30 * p.chemicals_base_cost, operators_required, total_capex * p.maintenance_factor / 12])
+    opex_unit_costs = np.array([p.electricity_cost, p.electricity_cost, p.chemical_cost_factor, p.operator_monthly_salary, 1.0])
+    opex_components = opex_bases * opex_unit_costs
+    monthly_ozone_power_cost, monthly_pumping_cost, monthly_chemical_cost, monthly_labor_cost, monthly_maintenance_cost = opex_components.tolist()
     
     # Total monthly OPEX
-    total_monthly_opex = monthly_ozone_power_cost + monthly_pumping_cost + monthly_chemical_cost + monthly_labor_cost + monthly_maintenance_cost
+    total_monthly_opex = float(opex_components.sum())
+    
+    return DesignCore(
+        cod_load_kg_per_day=cod_load_kg_per_day,
+        ozone_requirement_kg_per_day=ozone_requirement_kg_per_day,
+        num_parallel_reactors_needed=num_parallel_reactors_needed,
+        stages_needed=stages_needed,
+        num_reactor_trains=num_reactor_trains,
+        total_reactors=total_reactors,
+        num_ozone_generators=num_ozone_generators,
+        ozone_generator_cost=ozone_generator_cost,
+        cod_reduction_stages=cod_values,
+        pump_flow_rate_per_train=pump_flow_rate_per_train,
+        total_pump_flow_rate=total_pump_flow_rate,
+        recirculation_flow_rate=recirculation_flow_rate,
+        recirculation_pumps_required=recirculation_pumps_required,
+        total_influent_effluent_pumps=total_influent_effluent_pumps,
+        total_pumps=total_pumps,
+        aop_reactor_cost=aop_reactor_cost,
+        pump_cost=pump_cost,
+        filter_cost=filter_cost,
+        required_filter_area=required_filter_area,
+        filter_units=filter_units,
+        ph_adjustment_cost=ph_adjustment_cost,
+        piping_cost=piping_cost,
+        epc_cost=epc_cost,
+        total_capex=total_capex,
+        monthly_ozone_power_cost=monthly_ozone_power_cost,
+        daily_recirculation_energy=daily_recirculation_energy,
+        monthly_pumping_cost=monthly_pumping_cost,
+        monthly_chemical_cost=monthly_chemical_cost,
+        monthly_labor_cost=monthly_labor_cost,
+        monthly_maintenance_cost=monthly_maintenance_cost,
+        total_monthly_opex=total_monthly_opex,
+        operators_required=operators_required,
+        num_20ft_containers=num_20ft_containers,
+        num_40ft_containers=num_40ft_containers,
+        container_cost=container_cost,
+        total_equipment_units=total_equipment_units,
+    )
+
+# Calculate design values
+# Cached on the full set of inputs so reruns with unchanged parameters skip the calculation
+@st.cache_data(show_spinner=False, max_entries=128)
+def calculate_design_values(p):
+    core = design_core(p)
+    
+    # CAPEX and OPEX items for display
+    capex_items = {
+        "AOP Reactors": core.aop_reactor_cost,
+        "Ozone Generators": core.ozone_generator_cost,
+        "Pumping Equipment": core.pump_cost,
+        "Sand Filtration": core.filter_cost,
+        "pH Adjustment": core.ph_adjustment_cost,
+        "Container Housing": core.container_cost,
+        "Piping & Instrumentation": core.piping_cost,
+        "EPC": core.epc_cost
+    }
+    
+    opex_items = {
+        "Ozone Generation Power": core.monthly_ozone_power_cost,
+        "Pumping Power": core.monthly_pumping_cost,
+        "Chemicals": core.monthly_chemical_cost,
+        "Labor": core.monthly_labor_cost,
+        "Maintenance": core.monthly_maintenance_cost
+    }
     
+    design_values = SimpleNamespace(
+        flowrate=p.flowrate,
+        cod_inlet=p.cod_inlet,
+        cod_target=p.cod_target,
+        initial_ph=p.initial_ph,
+        reactor_size=p.reactor_size,
+        electricity_cost=p.electricity_cost,
+        chemical_cost_factor=p.chemical_cost_factor,
+        php_conversion_rate=p.php_conversion_rate,
+        **core._asdict()
+    )
+    design_values.cod_reduction_stages = design_values.cod_reduction_stages.tolist()
+    
+    # Headline costs in PHP, converted with a single vectorized multiply
+    php_cost_names = ["total_capex", "total_monthly_opex", "monthly_ozone_power_cost", "monthly_pumping_cost", "epc_cost"]
+    php_costs = dict(zip(php_cost_names, (np.array([getattr(core, name) for name in php_cost_names]) * p.php_conversion_rate).tolist()))
+    php_costs["annual_opex"] = php_costs["total_monthly_opex"] * 12
+    
+    # Total Bid Price + Tax & Contingency
+    php_costs["contingency"] = php_costs["total_capex"] * DESIGN.contingency_rate
+    php_costs["tax"] = php_costs["total_capex"] * (1 + DESIGN.contingency_rate) * DESIGN.tax_rate
+    php_costs["total_bid_price"] = php_costs["total_capex"] + php_costs["tax"] + php_costs["contingency"]
+    
+    # Everything the views need travels in one cached object
+    design_values.capex_items = capex_items
+    design_values.opex_items = opex_items
+    design_values.php_costs = php_costs
+    return design_values
+
+# Reactor train diagram, e.g. "Influent → [AOP Reactor 1] → [AOP Reactor 2] → Effluent"
+@st.cache_data(show_spinner=False)
+def build_train_diagram(n):
+    parts = ["Influent → [AOP Reactor 1] → "]
+    parts += [f"[AOP Reactor {i+1}] → " for i in range(1, n-1)]
+    parts.append(f"[AOP Reactor {n}] → Effluent")
+    return "".join(parts)
+
+# Per-stage COD table shown on the summary views. cache_resource hands back the same
+# DataFrame object on every rerun instead of the defensive copy cache_data would make.
+@st.cache_resource(show_spinner=False, max_entries=128)
+def cod_stage_df(cod_inlet, cod_target):
+    vals = cod_reduction_stages(cod_inlet, cod_target)
+    reds = np.empty_like(vals)
+    reds[0] = 0
+    reds[1:] = (1 - vals[1:] / vals[:-1]) * 100
+    stage_labels = ["Inlet"] + [f"Stage {i}" for i in range(1, vals.size)]
+    # Format whole columns at once rather than one f-string per cell
+    cod_text = np.char.mod("%.2f", vals)
+    reduction_text = np.char.mod("%.1f%%", reds)
+    reduction_text[0] = "0%"
+    cod_data = pd.DataFrame({
+        "Stage": stage_labels,
+        "COD (ppm)": cod_text,
+        "Reduction (%)": reduction_text
+    })
+    return cod_data.astype("category")
+
+# PHP currency formatting. The same totals are shown on several views, so the formatted
+# strings are memoized on the value rounded to the displayed precision. Per-unit costs
+# (per m³ / per L) are shown without a thousands separator.
+@lru_cache(maxsize=512)
+def php(v_rounded, decimals=2, grouping=True):
+    separator = "," if grouping else ""
+    return f"₱{v_rounded:{separator}.{decimals}f}"
+
+def fmt_php(v, decimals=2, grouping=True):
+    return php(round(v, decimals), decimals, grouping)
+
+# Label/value rows shown as a single table element instead of one st.metric element per row
+@st.cache_data(show_spinner=False, max_entries=128)
+def metric_table(rows):
+    return pd.DataFrame.from_records(rows, columns=["Metric", "Value"]).astype("category")
+
+# Cost breakdown bar chart, cached on the component names and costs so reruns with
+# unchanged costs reuse the chart instead of rebuilding it
+@st.cache_data(show_spinner=False, max_entries=128)
+def cost_bar_chart(components, costs_php):
+    chart_df = pd.DataFrame({"Component": components, "Cost (PHP)": costs_php})
+    return alt.Chart(chart_df).mark_bar().encode(
+        x=alt.X("Component:N", sort=None),
+        y="Cost (PHP):Q"
+    )
+
+# Parameter/Value columns for the full design summary tables, as plain lists
+def design_params_rows(flowrate, cod_inlet, cod_target, initial_ph):
     return {
-        "flowrate": flowrate,
-        "cod_inlet": cod_inlet,
-        "cod_target": cod_target,
-        "initial_ph": initial_ph,
-        "reactor_size": reactor_size,
-        "cod_load_kg_per_day": cod_load_kg_per_day,
-        "ozone_requirement_kg_per_day": ozone_requirement_kg_per_day,
-        "num_parallel_reactors_needed": num_parallel_reactors_needed,
-        "stages_needed": stages_needed,
-        "num_reactor_trains": num_reactor_trains,
-        "total_reactors": total_reactors,
-        "num_ozone_generators": num_ozone_generators,
-        "ozone_generator_cost": ozone_generator_cost,
-        "cod_reduction_stages": cod_values,
-        "pump_flow_rate_per_train": pump_flow_rate_per_train,
-        "total_pump_flow_rate": total_pump_flow_rate,
-        "recirculation_flow_rate": recirculation_flow_rate,
-        "recirculation_pumps_required": recirculation_pumps_required,
-        "total_influent_effluent_pumps": total_influent_effluent_pumps,
-        "total_pumps": total_pumps,
-        "aop_reactor_cost": aop_reactor_cost,
-        "pump_cost": pump_cost,
-        "filter_cost": filter_cost,
-        "filter_units": filter_units,
-        "ph_adjustment_cost": ph_adjustment_cost,
-        "piping_cost": piping_cost,
-        "epc_cost": epc_cost,
-        "total_capex": total_capex,
-        "monthly_ozone_power_cost": monthly_ozone_power_cost,
-        "daily_recirculation_energy": daily_recirculation_energy,
-        "monthly_pumping_cost": monthly_pumping_cost,
-        "monthly_chemical_cost": monthly_chemical_cost,
-        "monthly_labor_cost": monthly_labor_cost,
-        "monthly_maintenance_cost": monthly_maintenance_cost,
-        "total_monthly_opex": total_monthly_opex,
-        "electricity_cost": electricity_cost,
-        "chemical_cost_factor": chemical_cost_factor,
-        "operators_required": operators_required,
-        "php_conversion_rate": php_conversion_rate,
-        "num_20ft_containers": num_20ft_containers,
-        "num_40ft_containers": num_40ft_containers,
-        "container_cost": container_cost,
-        "total_equipment_units": total_equipment_units
+        "Parameter": [
+            "Flowrate",
+            "COD Inlet",
+            "COD Target",
+            "COD Reduction",
+            "Initial pH",
+            "Pre-AOP Target pH",
+            "Post-Filtration Target pH"
+        ],
+        "Value": [
+            f"{flowrate:.2f} m³/day",
+            f"{cod_inlet:.2f} ppm",
+            f"{cod_target:.2f} ppm",
+            f"{100 * (1 - cod_target/cod_inlet):.1f}%",
+            f"{initial_ph:.1f}",
+            "9.5",
+            "7.0"
+        ]
     }
 
-# Tab 5: Standard Rates
-with tab5:
-    st.header("Standard Cost Rates")
-    st.write("Adjust standard cost rates used in the calculations. All final costs will be reported in Philippine Pesos (PHP).")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Equipment Costs")
-        aop_reactor_unit_cost = st.number_input("AOP Reactor Cost (USD)", min_value=500.0, max_value=1000.0, value=650.0, step=50.0)
-        pump_unit_cost = st.number_input("Pump Unit Cost (USD)", min_value=500.0, max_value=1000.0, value=650.0, step=50.0)
-        filter_unit_cost = st.number_input("Filter Cost per m² (USD)", min_value=500.0, max_value=1000.0, value=650.0, step=50.0)
-        ph_adjustment_unit_cost = st.number_input("pH Adjustment System Cost (USD)", min_value=500.0, max_value=1000.0, value=650.0, step=50.0)
-        ozone_generator_unit_cost = st.number_input("Ozone Generator Unit Cost (USD)", min_value=500.0, max_value=1000.0, value=650.0, step=50.0)
-        
-        st.subheader("Container Housing Costs")
-        container_20ft_cost = st.number_input("20ft Container Cost (USD)", min_value=4000.0, max_value=8000.0, value=6000.0, step=500.0)
-        container_40ft_cost = st.number_input("40ft Container Cost (USD)", min_value=5000.0, max_value=10000.0, value=7000.0, step=500.0)
-    
-    with col2:
-        st.subheader("Operational Costs and Factors")
-        operator_monthly_salary = st.number_input("Operator Monthly Salary (USD)", min_value=300.0, max_value=1000.0, value=450.0, step=50.0)
-        ozone_power_consumption = st.number_input("Ozone Power Consumption (kWh per kg)", min_value=1.0, max_value=5.0, value=3.0, step=0.5)
-        pump_power_consumption = st.number_input("Pump Power Consumption (kWh per m³)", min_value=0.03, max_value=0.15, value=0.05, step=0.01)
-        chemicals_base_cost = st.number_input("Chemical Base Cost (USD per m³)", min_value=0.1, max_value=1.0, value=0.25, step=0.05)
-        maintenance_factor = st.number_input("Maintenance Cost (% of CAPEX per year)", min_value=2.5, max_value=15.0, value=10.0, step=0.5)
-    
-    st.subheader("Engineering and Construction Factors")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        piping_factor = st.number_input("Piping Cost (% of equipment cost)", min_value=20.0, max_value=40.0, value=30.0, step=5.0) / 100.0
-    
-    with col2:
-        epc_factor = st.number_input("EPC Factor (% of direct costs)", min_value=20.0, max_value=60.0, value=30.0, step=5.0) / 100.0
-        
-    # Information about PHP conversion
-    st.info(f"The USD to PHP conversion rate is currently set to: {php_conversion_rate:.2f} PHP per USD. All cost displays in this dashboard will be shown in Philippine Pesos (PHP).")
+def design_details_rows(cod_load_kg_per_day, ozone_requirement_kg_per_day, required_filter_area, total_pump_flow_rate):
+    return {
+        "Parameter": [
+            "COD Load",
+            "Ozone Requirement",
+            "Ozone Requirement per COD",
+            "Required Filter Area",
+            "Filtration Loading Rate",
+            "Peak Flow Rate"
+        ],
+        "Value": [
+            f"{cod_load_kg_per_day:.2f} kg/day",
+            f"{ozone_requirement_kg_per_day:.2f} kg/day",
+            f"{DESIGN.ozone_dose} g O₃/g COD",
+            f"{required_filter_area:.2f} m²",
+            f"{DESIGN.filtration_loading_rate} m³/m²/hour",
+            f"{total_pump_flow_rate:.2f} m³/hour"
+        ]
+    }
 
-# Calculate design values using the user-adjusted standard rates from tab 5
-design_values = calculate_design_values(
-    aop_reactor_unit_cost, 
-    pump_unit_cost, 
-    filter_unit_cost, 
-    ph_adjustment_unit_cost, 
-    ozone_generator_unit_cost, 
-    operator_monthly_salary, 
-    ozone_power_consumption, 
-    pump_power_consumption, 
-    chemicals_base_cost, 
-    maintenance_factor / 100.0,  # Convert from percentage to decimal
-    piping_factor, 
-    epc_factor,
-    container_20ft_cost,  # Add container costs
-    container_40ft_cost
-)
+def reactor_details_rows(reactor_size, stages_needed, num_reactor_trains, total_reactors, num_ozone_generators):
+    return {
+        "Parameter": [
+            "AOP Reactor Size",
+            "AOP Reactors per Train",
+            "Reactor Trains Required",
+            "Total AOP Reactors",
+            "Total Ozone Generators",
+            "Ozone Generator Capacity",
+            "Total Ozone Generation Capacity"
+        ],
+        "Value": [
+            f"{reactor_size:.1f} m³",
+            f"{stages_needed}",
+            f"{num_reactor_trains}",
+            f"{total_reactors}",
+            f"{num_ozone_generators}",
+            f"{DESIGN.ozone_generator_capacity} g/hour per generator",
+            f"{num_ozone_generators * DESIGN.ozone_generator_capacity} g/hour"
+        ]
+    }
 
-# Define CAPEX and OPEX items for display
-capex_items = {
-    "AOP Reactors": design_values['aop_reactor_cost'],
-    "Ozone Generators": design_values['ozone_generator_cost'],
-    "Pumping Equipment": design_values['pump_cost'],
-    "Sand Filtration": design_values['filter_cost'],
-    "pH Adjustment": design_values['ph_adjustment_cost'],
-    "Container Housing": design_values['container_cost'],
-    "Piping & Instrumentation": design_values['piping_cost'],
-    "EPC": design_values['epc_cost']
-}
+def pump_details_rows(num_reactor_trains, recirculation_pumps_required, total_pumps, pump_flow_rate_per_train, total_pump_flow_rate, recirculation_flow_rate):
+    return {
+        "Parameter": [
+            "Influent Pumps",
+            "Effluent Pumps",
+            "Recirculation Pumps",
+            "Total Pumps",
+            "Pump Flow Rate (per train)",
+            "Total Influent/Effluent Pump Capacity",
+            "Recirculation Flow Rate",
+        ],
+        "Value": [
+            f"{num_reactor_trains * 2} (1 running, 1 standby per train)",
+            f"{num_reactor_trains * 2} (1 running, 1 standby per train)",
+            f"{recirculation_pumps_required} (1 running, 1 standby)",
+            f"{total_pumps}",
+            f"{pump_flow_rate_per_train:.2f} m³/hour",
+            f"{total_pump_flow_rate:.2f} m³/hour",
+            f"{recirculation_flow_rate:.2f} m³/hour",
+        ]
+    }
 
-opex_items = {
-    "Ozone Generation Power": design_values['monthly_ozone_power_cost'],
-    "Pumping Power": design_values['monthly_pumping_cost'],
-    "Chemicals": design_values['monthly_chemical_cost'],
-    "Labor": design_values['monthly_labor_cost'],
-    "Maintenance": design_values['monthly_maintenance_cost']
-}
+# Tables for the full design summary view, cached on the scalar inputs they are built from
+@st.cache_data(show_spinner=False, max_entries=128)
+def design_params_df(*args):
+    return pd.DataFrame(design_params_rows(*args))
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def design_details_df(*args):
+    return pd.DataFrame(design_details_rows(*args))
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def reactor_details_df(*args):
+    return pd.DataFrame(reactor_details_rows(*args))
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def pump_details_df(*args):
+    return pd.DataFrame(pump_details_rows(*args))
+
+# Combined table for the design summary CSV download, built from the joined columns in one go.
+# The design date is only part of the export; on screen it is a caption.
+@st.cache_data(show_spinner=False, max_entries=128)
+def design_summary_df(params_args, details_args, reactor_args, pump_args, design_date):
+    tables = (
+        design_params_rows(*params_args),
+        {"Parameter": ["Design Date"], "Value": [design_date]},
+        design_details_rows(*details_args),
+        reactor_details_rows(*reactor_args),
+        pump_details_rows(*pump_args)
+    )
+    return pd.DataFrame({
+        "Parameter": [name for table in tables for name in table["Parameter"]],
+        "Value": [value for table in tables for value in table["Value"]]
+    })
+
+# Calculate design values using the user-adjusted standard rates
+design_values = calculate_design_values(params)
 
+# CSV export shared by the design summary and cost analysis downloads. The current bytes
+# are also kept per session in session_state, so this cache only needs a few entries.
+@st.cache_data(show_spinner=False, max_entries=16)
+def convert_df_to_csv(df):
+    return df.to_csv(index=False).encode("utf-8")
 
 # Tab 1: AOP Summary (Redesigned as a comprehensive landing page)
-with tab1:
+def render_summary(dv):
+    php_costs = dv.php_costs
     st.header("ECH2O Advanced Oxidation Process Design Summary")
     
     # Design overview at the top
     st.markdown(f"""
-    ### Design Overview for {design_values['flowrate']:.1f} m³/day Wastewater Treatment Plant
+    ### Design Overview for {dv.flowrate:.1f} m³/day Wastewater Treatment Plant
     This dashboard summarizes the complete design for a modular Advanced Oxidation Process (AOP) wastewater treatment 
-    system configured for {design_values['cod_inlet']:.0f} ppm inlet COD with a target of {design_values['cod_target']:.0f} ppm outlet COD.
+    system configured for {dv.cod_inlet:.0f} ppm inlet COD with a target of {dv.cod_target:.0f} ppm outlet COD.
     """)
     
     # Create 3 columns for the key metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total AOP Reactors", f"{design_values['total_reactors']}")
-        st.metric("Total Pumps", f"{design_values['total_pumps']}")
+        st.metric("Total AOP Reactors", f"{dv.total_reactors}")
+        st.metric("Total Pumps", f"{dv.total_pumps}")
         
     with col2:
-        st.metric("COD Reduction", f"{100 * (1 - design_values['cod_target']/design_values['cod_inlet']):.1f}%")
-        st.metric("Total Housed Units", f"{design_values['total_equipment_units']}")
+        st.metric("COD Reduction", f"{100 * (1 - dv.cod_target/dv.cod_inlet):.1f}%")
+        st.metric("Total Housed Units", f"{dv.total_equipment_units}")
         
     with col3:
-        if design_values['num_20ft_containers'] > 0:
-            st.metric("20ft Containers", f"{design_values['num_20ft_containers']}")
-        if design_values['num_40ft_containers'] > 0:
-            st.metric("40ft Containers", f"{design_values['num_40ft_containers']}")
+        if dv.num_20ft_containers > 0:
+            st.metric("20ft Containers", f"{dv.num_20ft_containers}")
+        if dv.num_40ft_containers > 0:
+            st.metric("40ft Containers", f"{dv.num_40ft_containers}")
             
     with col4:
-        total_capex_php = design_values['total_capex'] * design_values['php_conversion_rate']
-        total_monthly_opex_php = design_values['total_monthly_opex'] * design_values['php_conversion_rate']
-        
-        # Calculate Total Bid Price + Tax & Contingency
-        contingency_php = total_capex_php * 0.1
-        tax_php = total_capex_php * 1.1 * 0.12
-        total_bid_price_php = total_capex_php + tax_php + contingency_php
-        
-        st.metric("Total Bid Price", f"₱{total_bid_price_php:,.0f}")
-        st.metric("Monthly OPEX", f"₱{total_monthly_opex_php:,.0f}")
+        st.metric("Total Bid Price", fmt_php(php_costs['total_bid_price'], 0))
+        st.metric("Monthly OPEX", fmt_php(php_costs['total_monthly_opex'], 0))
     
     # Horizontal divider
     st.markdown("---")
@@ -368,48 +731,37 @@ with tab1:
         
         with col1:
             st.subheader("COD Treatment Process")
-            st.metric("Initial COD", f"{design_values['cod_inlet']:.2f} ppm")
-            st.metric("Target COD", f"{design_values['cod_target']:.2f} ppm")
-            st.metric("COD Load", f"{design_values['cod_load_kg_per_day']:.2f} kg/day")
-            st.metric("Ozone Requirement", f"{design_values['ozone_requirement_kg_per_day']:.2f} kg/day")
+            st.table(metric_table((
+                ("Initial COD", f"{dv.cod_inlet:.2f} ppm"),
+                ("Target COD", f"{dv.cod_target:.2f} ppm"),
+                ("COD Load", f"{dv.cod_load_kg_per_day:.2f} kg/day"),
+                ("Ozone Requirement", f"{dv.ozone_requirement_kg_per_day:.2f} kg/day"),
+            )))
             
             # System schematic
             st.subheader("System Schematic")
             
-            schematic = """
-            Raw Wastewater → pH Adjustment (to 9.5) → AOP Reactor Trains → Sand Filtration → pH Adjustment (to 7.0) → Treated Effluent
-                                                        |       ↑
-                                                        v       |
-                                                    Each train: |
-                                                    [AOP 1] → [AOP 2] → ... → [AOP n]
-                                                        ↑_______|_______↓
-                                                            Recirculation
-            """
-            
-            st.code(schematic)
+            st.code(SCHEMATIC)
             
         with col2:
             # Show COD reduction stages
             st.subheader("COD Reduction by Stage")
-            cod_data = pd.DataFrame({
-                "Stage": [f"Stage {i}" if i > 0 else "Inlet" for i in range(len(design_values['cod_reduction_stages']))],
-                "COD (ppm)": [f"{cod:.2f}" for cod in design_values['cod_reduction_stages']],
-                "Reduction (%)": ["0%"] + [f"{100 * (1 - design_values['cod_reduction_stages'][i]/design_values['cod_reduction_stages'][i-1]):.1f}%" 
-                               for i in range(1, len(design_values['cod_reduction_stages']))]
-            })
+            cod_data = cod_stage_df(dv.cod_inlet, dv.cod_target)
             st.table(cod_data)
             
             # pH adjustment overview
             st.subheader("pH Adjustment")
-            st.metric("Initial pH", f"{design_values['initial_ph']}")
-            st.metric("Pre-AOP Target pH", "9.5")
-            st.metric("Post-Filtration Target pH", "7.0")
+            st.table(metric_table((
+                ("Initial pH", f"{dv.initial_ph}"),
+                ("Pre-AOP Target pH", "9.5"),
+                ("Post-Filtration Target pH", "7.0"),
+            )))
             
-            if design_values['initial_ph'] < 9.5:
-                ph_change = 9.5 - design_values['initial_ph']
+            if dv.initial_ph < 9.5:
+                ph_change = 9.5 - dv.initial_ph
                 st.write(f"Need to raise initial pH by {ph_change:.1f} units")
-            elif design_values['initial_ph'] > 9.5:
-                ph_change = design_values['initial_ph'] - 9.5
+            elif dv.initial_ph > 9.5:
+                ph_change = dv.initial_ph - 9.5
                 st.write(f"Need to lower initial pH by {ph_change:.1f} units")
     
     # Tab 2: Equipment Summary
@@ -418,77 +770,62 @@ with tab1:
         
         with col1:
             st.subheader("Reactor Configuration")
-            st.metric("AOP Reactor Size", f"{design_values['reactor_size']} m³")
-            st.metric("AOP Reactors per Train", f"{design_values['stages_needed']}")
-            st.metric("Reactor Trains Required", f"{design_values['num_reactor_trains']}")
-            st.metric("Total AOP Reactors", f"{design_values['total_reactors']}")
-            st.metric("Total Ozone Generators", f"{design_values['num_ozone_generators']}")
+            st.table(metric_table((
+                ("AOP Reactor Size", f"{dv.reactor_size} m³"),
+                ("AOP Reactors per Train", f"{dv.stages_needed}"),
+                ("Reactor Trains Required", f"{dv.num_reactor_trains}"),
+                ("Total AOP Reactors", f"{dv.total_reactors}"),
+                ("Total Ozone Generators", f"{dv.num_ozone_generators}"),
+            )))
             
             # Reactor train diagram
             st.subheader("Reactor Train Configuration")
             st.write("Each train consists of AOP reactors connected in series:")
             
-            diagram = ""
-            for i in range(design_values['stages_needed']):
-                if i == 0:
-                    diagram += "Influent → [AOP Reactor 1] → "
-                elif i == design_values['stages_needed'] - 1:
-                    diagram += "[AOP Reactor " + str(i+1) + "] → Effluent"
-                else:
-                    diagram += "[AOP Reactor " + str(i+1) + "] → "
-            
-            st.code(diagram)
+            st.code(build_train_diagram(dv.stages_needed))
             st.write("Note: The last reactor in each train connects to the preceding reactor via gravity flow.")
             
         with col2:
             st.subheader("Pump Configuration")
-            st.metric("Influent Pumps", f"{design_values['num_reactor_trains'] * 2}")
-            st.metric("Effluent Pumps", f"{design_values['num_reactor_trains'] * 2}")
-            st.metric("Recirculation Pumps", f"{design_values['recirculation_pumps_required']}")
-            st.metric("Total Pumps", f"{design_values['total_pumps']}")
-            st.metric("Pump Flow Rate (per train)", f"{design_values['pump_flow_rate_per_train']:.2f} m³/hour")
-            st.metric("Recirculation Flow Rate", f"{design_values['recirculation_flow_rate']:.2f} m³/hour")
+            st.table(metric_table((
+                ("Influent Pumps", f"{dv.num_reactor_trains * 2}"),
+                ("Effluent Pumps", f"{dv.num_reactor_trains * 2}"),
+                ("Recirculation Pumps", f"{dv.recirculation_pumps_required}"),
+                ("Total Pumps", f"{dv.total_pumps}"),
+                ("Pump Flow Rate (per train)", f"{dv.pump_flow_rate_per_train:.2f} m³/hour"),
+                ("Recirculation Flow Rate", f"{dv.recirculation_flow_rate:.2f} m³/hour"),
+            )))
             
             # Pump diagram
             st.subheader("Pump Configuration Diagram")
-            pump_diagram = """
-            Influent Storage → [Influent Pumps] → AOP Reactor Trains → [Effluent Pumps] → Effluent Storage
-                                                       ↑       ↓
-                                                [Recirculation Pumps]
-            """
-            st.code(pump_diagram)
+            st.code(PUMP_DIAGRAM)
         
         # Container housing information
         st.subheader("Container Housing Requirements")
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Equipment Units", f"{design_values['total_equipment_units']}")
+            st.metric("Total Equipment Units", f"{dv.total_equipment_units}")
             st.write(f"(AOP Reactors + Filters)")
             
         with col2:
-            if design_values['num_20ft_containers'] > 0:
-                st.metric("20ft Containers", f"{design_values['num_20ft_containers']}")
-                st.write("Each 20ft container houses up to 6 equipment units")
+            if dv.num_20ft_containers > 0:
+                st.metric("20ft Containers", f"{dv.num_20ft_containers}")
+                st.write(f"Each 20ft container houses up to {DESIGN.container_20ft_capacity} equipment units")
             
         with col3:
-            if design_values['num_40ft_containers'] > 0:
-                st.metric("40ft Containers", f"{design_values['num_40ft_containers']}")
-                st.write("Each 40ft container houses up to 12 equipment units")
+            if dv.num_40ft_containers > 0:
+                st.metric("40ft Containers", f"{dv.num_40ft_containers}")
+                st.write(f"Each 40ft container houses up to {DESIGN.container_40ft_capacity} equipment units")
                 
-        st.info(f"""
-        Container housing information:
-        - Each 20ft container costs $6,000 and can house up to 6 equipment units (reactors or filters)
-        - Each 40ft container costs $7,000 and can house up to 12 equipment units (reactors or filters)
-        - For flowrates ≤15 m³/day, 20ft containers are used
-        - For flowrates >15 m³/day, 40ft containers are used primarily
-        - Additional equipment is housed in either 20ft or 40ft containers based on the count
-        """)
+        st.info(CONTAINER_HOUSING_NOTE)
         
         # Filtration information
         st.subheader("Filtration System")
-        st.metric("Required Filter Area", f"{design_values['total_pump_flow_rate'] / 10:.2f} m²")
-        st.metric("Filter Units", f"{design_values['filter_units']}")
+        st.table(metric_table((
+            ("Required Filter Area", f"{dv.required_filter_area:.2f} m²"),
+            ("Filter Units", f"{dv.filter_units}"),
+        )))
     
     # Tab 3: System Performance
     with summary_tabs[2]:
@@ -496,130 +833,106 @@ with tab1:
         
         with col1:
             st.subheader("Energy Requirements")
-            st.metric("Ozone Generation", f"{design_values['ozone_requirement_kg_per_day'] * 3:.2f} kWh/day")
-            st.metric("Pumping", f"{design_values['flowrate'] * 0.05:.2f} kWh/day")
-            st.metric("Recirculation", f"{design_values['daily_recirculation_energy']:.2f} kWh/day")
-            
-            total_daily_energy = (design_values['ozone_requirement_kg_per_day'] * 3) + \
-                                (design_values['flowrate'] * 0.05) + \
-                                design_values['daily_recirculation_energy']
+            total_daily_energy = (dv.ozone_requirement_kg_per_day * 3) + \
+                                (dv.flowrate * 0.05) + \
+                                dv.daily_recirculation_energy
             
-            st.metric("Total Daily Energy", f"{total_daily_energy:.2f} kWh/day")
-            st.metric("Monthly Energy Cost", f"₱{design_values['monthly_ozone_power_cost'] * design_values['php_conversion_rate'] + design_values['monthly_pumping_cost'] * design_values['php_conversion_rate']:,.2f}")
+            st.table(metric_table((
+                ("Ozone Generation", f"{dv.ozone_requirement_kg_per_day * 3:.2f} kWh/day"),
+                ("Pumping", f"{dv.flowrate * 0.05:.2f} kWh/day"),
+                ("Recirculation", f"{dv.daily_recirculation_energy:.2f} kWh/day"),
+                ("Total Daily Energy", f"{total_daily_energy:.2f} kWh/day"),
+                ("Monthly Energy Cost", fmt_php(php_costs['monthly_ozone_power_cost'] + php_costs['monthly_pumping_cost'])),
+            )))
             
         with col2:
             st.subheader("Cost Summary")
             
-            # Display simplified CAPEX and OPEX
-            capex_php = design_values['total_capex'] * design_values['php_conversion_rate']
-            monthly_opex_php = design_values['total_monthly_opex'] * design_values['php_conversion_rate']
-            annual_opex_php = monthly_opex_php * 12
-            
-            st.metric("Total CAPEX", f"₱{capex_php:,.2f}")
-            st.metric("Monthly OPEX", f"₱{monthly_opex_php:,.2f}")
-            st.metric("Annual OPEX", f"₱{annual_opex_php:,.2f}")
-            
             # Calculate cost per cubic meter
-            daily_cost = monthly_opex_php / 30
-            cost_per_m3 = daily_cost / design_values['flowrate']
+            daily_cost = php_costs['total_monthly_opex'] / 30
+            cost_per_m3 = daily_cost / dv.flowrate
             
-            st.metric("Treatment Cost", f"₱{cost_per_m3:.2f}/m³")
+            # Display simplified CAPEX and OPEX
+            st.table(metric_table((
+                ("Total CAPEX", fmt_php(php_costs['total_capex'])),
+                ("Monthly OPEX", fmt_php(php_costs['total_monthly_opex'])),
+                ("Annual OPEX", fmt_php(php_costs['annual_opex'])),
+                ("Treatment Cost", fmt_php(cost_per_m3, grouping=False) + "/m³"),
+            )))
             
     # Add final note about detailed information
     st.markdown("---")
     st.info("For detailed information on specific system components, please see the respective tabs above.")
 
 
-
 # Tab 2: Wastewater Conveyance
-with tab2:
+def render_conveyance(dv):
     st.header("Wastewater Conveyance (Pump Requirements)")
     
-    st.info("""
-    **Pump Configuration:**
-    - Each conveyance requires 1 running and 1 standby configuration.
-    - Influent pumps fill the first reactors in each train simultaneously in 15 minutes.
-    - Effluent pumps drain the last reactors in each train simultaneously in 15 minutes.
-    - Recirculation pumps continuously recirculate AOP reactor volumes.
-    """)
+    st.info(PUMP_CONFIGURATION_NOTE)
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.subheader("Influent Pumps")
-        st.metric("Number of Pump Trains", f"{design_values['num_reactor_trains']}")
+        st.metric("Number of Pump Trains", f"{dv.num_reactor_trains}")
         st.metric("Pumps per Train", "2 (1 running, 1 standby)")
-        st.metric("Total Influent Pumps", f"{design_values['num_reactor_trains'] * 2}")
-        st.metric("Flow Rate per Pump", f"{design_values['pump_flow_rate_per_train']:.2f} m³/hour")
-        st.metric("Total Influent Pump Capacity", f"{design_values['total_pump_flow_rate']:.2f} m³/hour")
+        st.metric("Total Influent Pumps", f"{dv.num_reactor_trains * 2}")
+        st.metric("Flow Rate per Pump", f"{dv.pump_flow_rate_per_train:.2f} m³/hour")
+        st.metric("Total Influent Pump Capacity", f"{dv.total_pump_flow_rate:.2f} m³/hour")
     
     with col2:
         st.subheader("Effluent Pumps")
-        st.metric("Number of Pump Trains", f"{design_values['num_reactor_trains']}")
+        st.metric("Number of Pump Trains", f"{dv.num_reactor_trains}")
         st.metric("Pumps per Train", "2 (1 running, 1 standby)")
-        st.metric("Total Effluent Pumps", f"{design_values['num_reactor_trains'] * 2}")
-        st.metric("Flow Rate per Pump", f"{design_values['pump_flow_rate_per_train']:.2f} m³/hour")
-        st.metric("Total Effluent Pump Capacity", f"{design_values['total_pump_flow_rate']:.2f} m³/hour")
+        st.metric("Total Effluent Pumps", f"{dv.num_reactor_trains * 2}")
+        st.metric("Flow Rate per Pump", f"{dv.pump_flow_rate_per_train:.2f} m³/hour")
+        st.metric("Total Effluent Pump Capacity", f"{dv.total_pump_flow_rate:.2f} m³/hour")
     
     with col3:
         st.subheader("Recirculation Pumps")
-        st.metric("Total Recirculation Pumps", f"{design_values['recirculation_pumps_required']} (1 running, 1 standby)")
-        st.metric("Recirculation Flow Rate", f"{design_values['recirculation_flow_rate']:.2f} m³/hour")
+        st.metric("Total Recirculation Pumps", f"{dv.recirculation_pumps_required} (1 running, 1 standby)")
+        st.metric("Recirculation Flow Rate", f"{dv.recirculation_flow_rate:.2f} m³/hour")
         st.metric("Recirculation Formula", "# AOP reactors × volume × 5 / 2 hrs")
-        st.metric("Recirculation Energy", f"{design_values['daily_recirculation_energy']:.2f} kWh/day")
+        st.metric("Recirculation Energy", f"{dv.daily_recirculation_energy:.2f} kWh/day")
         
         # Explanation of recirculation
-        st.info("""
-        The recirculation pump train handles the continuous recirculation of AOP reactor volumes
-        to ensure optimal treatment efficiency and mixing.
-        """)
+        st.info(RECIRCULATION_NOTE)
 
     # Summary of all pumps
     st.subheader("Total Pump Requirements")
-    st.metric("Total Pumps Required", f"{design_values['total_pumps']}")
-    st.metric("Total Pump Cost", f"${design_values['pump_cost']:,.2f}")
+    st.metric("Total Pumps Required", f"{dv.total_pumps}")
+    st.metric("Total Pump Cost", f"${dv.pump_cost:,.2f}")
     
     # Pump diagram
     st.subheader("Pump Configuration Diagram")
-    pump_diagram = """
-    Influent Storage → [Influent Pumps] → AOP Reactor Trains → [Effluent Pumps] → Effluent Storage
-                                               ↑       ↓
-                                        [Recirculation Pumps]
-    """
-    st.code(pump_diagram)
+    st.code(PUMP_DIAGRAM)
+
 
 # Tab 3: Filtration Requirements
-with tab3:
+def render_filtration(dv):
     st.header("Filtration Requirements")
     
-    st.info("""
-    **Sand Filtration System:**
-    - Sand filtration follows the AOP process to remove any remaining particulates.
-    - Sizing is based on the total flow rate from all AOP reactor trains.
-    """)
+    st.info(FILTRATION_NOTE)
     
-    st.metric("Total Flow to Filtration", f"{flowrate:.2f} m³/day")
-    st.metric("Average Hourly Flow", f"{flowrate/24:.2f} m³/hour")
-    st.metric("Peak Hourly Flow (Design)", f"{design_values['total_pump_flow_rate']:.2f} m³/hour")
+    st.metric("Total Flow to Filtration", f"{dv.flowrate:.2f} m³/day")
+    st.metric("Average Hourly Flow", f"{dv.flowrate/24:.2f} m³/hour")
+    st.metric("Peak Hourly Flow (Design)", f"{dv.total_pump_flow_rate:.2f} m³/hour")
     
     # Filtration design parameters
-    filtration_loading_rate = 10  # m³/m²/hour (typical value)
-    required_filter_area = design_values['total_pump_flow_rate'] / filtration_loading_rate
-    
-    st.metric("Required Filter Area", f"{required_filter_area:.2f} m²")
-    st.metric("Recommended Filter Units", f"{max(2, int(np.ceil(required_filter_area/5)))}")
+    st.metric("Required Filter Area", f"{dv.required_filter_area:.2f} m²")
+    st.metric("Recommended Filter Units", f"{dv.filter_units}")
     
     st.write("**Note:** Sand filters should be designed with n+1 redundancy for maintenance purposes.")
 
+
 # Tab 4: pH Adjustment
-with tab4:
+def render_ph_adjustment(dv):
+    initial_ph = dv.initial_ph
+    
     st.header("pH Adjustment Requirements")
     
-    st.info("""
-    **pH Adjustment Process:**
-    1. Inlet pH needs to be raised to 9.5 before the first AOP reactor
-    2. pH needs to be neutralized back to 7.0 after sand filtration
-    """)
+    st.info(PH_ADJUSTMENT_NOTE)
     
     col1, col2 = st.columns(2)
     
@@ -648,191 +961,134 @@ with tab4:
         st.write("Recommended Chemical: Carbon Dioxide (CO₂) or Sulfuric Acid (H₂SO₄)")
     
     st.subheader("pH Adjustment System Components")
-    st.write("""
-    - Chemical storage tanks with secondary containment
-    - Chemical dosing pumps with flow-paced control
-    - Inline pH monitoring equipment
-    - Mixing systems at injection points
-    - Safety equipment for chemical handling
-    """)
+    st.markdown(PH_SYSTEM_COMPONENTS_NOTE)
+
+
+# Tab 5: Standard Rates
+def render_standard_rates(php_conversion_rate):
+    st.header("Standard Cost Rates")
+    st.write("Adjust standard cost rates used in the calculations. All final costs will be reported in Philippine Pesos (PHP).")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Equipment Costs")
+        st.number_input("AOP Reactor Cost (USD)", min_value=500.0, max_value=1000.0, step=50.0, key="aop_reactor_unit_cost")
+        st.number_input("Pump Unit Cost (USD)", min_value=500.0, max_value=1000.0, step=50.0, key="pump_unit_cost")
+        st.number_input("Filter Cost per m² (USD)", min_value=500.0, max_value=1000.0, step=50.0, key="filter_unit_cost")
+        st.number_input("pH Adjustment System Cost (USD)", min_value=500.0, max_value=1000.0, step=50.0, key="ph_adjustment_unit_cost")
+        st.number_input("Ozone Generator Unit Cost (USD)", min_value=500.0, max_value=1000.0, step=50.0, key="ozone_generator_unit_cost")
+        
+        st.subheader("Container Housing Costs")
+        st.number_input("20ft Container Cost (USD)", min_value=4000.0, max_value=8000.0, step=500.0, key="container_20ft_cost")
+        st.number_input("40ft Container Cost (USD)", min_value=5000.0, max_value=10000.0, step=500.0, key="container_40ft_cost")
+    
+    with col2:
+        st.subheader("Operational Costs and Factors")
+        st.number_input("Operator Monthly Salary (USD)", min_value=300.0, max_value=1000.0, step=50.0, key="operator_monthly_salary")
+        st.number_input("Ozone Power Consumption (kWh per kg)", min_value=1.0, max_value=5.0, step=0.5, key="ozone_power_consumption")
+        st.number_input("Pump Power Consumption (kWh per m³)", min_value=0.03, max_value=0.15, step=0.01, key="pump_power_consumption")
+        st.number_input("Chemical Base Cost (USD per m³)", min_value=0.1, max_value=1.0, step=0.05, key="chemicals_base_cost")
+        st.number_input("Maintenance Cost (% of CAPEX per year)", min_value=2.5, max_value=15.0, step=0.5, key="maintenance_factor")
+    
+    st.subheader("Engineering and Construction Factors")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.number_input("Piping Cost (% of equipment cost)", min_value=20.0, max_value=40.0, step=5.0, key="piping_factor")
+    
+    with col2:
+        st.number_input("EPC Factor (% of direct costs)", min_value=20.0, max_value=60.0, step=5.0, key="epc_factor")
+        
+    # Information about PHP conversion
+    st.info(f"The USD to PHP conversion rate is currently set to: {php_conversion_rate:.2f} PHP per USD. All cost displays in this dashboard will be shown in Philippine Pesos (PHP).")
 
 
 # Tab 6: Full Design Summary
-with tab6:
+def render_design_summary(dv):
     st.header("Complete Design Summary")
     
+    num_reactor_trains = dv.num_reactor_trains
+    total_pump_flow_rate = dv.total_pump_flow_rate
+    
+    # Tables are built by cached helpers keyed on the scalar inputs they use
+    params_args = (dv.flowrate, dv.cod_inlet, dv.cod_target, dv.initial_ph)
+    design_date = date.today().isoformat()
+    details_args = (dv.cod_load_kg_per_day, dv.ozone_requirement_kg_per_day, dv.required_filter_area, total_pump_flow_rate)
+    reactor_args = (dv.reactor_size, dv.stages_needed, num_reactor_trains, dv.total_reactors, dv.num_ozone_generators)
+    pump_args = (num_reactor_trains, dv.recirculation_pumps_required, dv.total_pumps, dv.pump_flow_rate_per_train, total_pump_flow_rate, dv.recirculation_flow_rate)
+    
     # Create four sections for the organized design summary
     section1, section2 = st.tabs(["Design Summary", "Design Specifications"])
     
     with section1:
         st.subheader("Design Parameters")
-        
-        # Create dataframes for each category to better organize the information
-        design_params = {
-            "Parameter": [
-                "Flowrate",
-                "COD Inlet",
-                "COD Target",
-                "COD Reduction",
-                "Initial pH",
-                "Pre-AOP Target pH",
-                "Post-Filtration Target pH",
-                "Design Date"
-            ],
-            "Value": [
-                f"{design_values['flowrate']:.2f} m³/day",
-                f"{design_values['cod_inlet']:.2f} ppm",
-                f"{design_values['cod_target']:.2f} ppm",
-                f"{100 * (1 - design_values['cod_target']/design_values['cod_inlet']):.1f}%",
-                f"{design_values['initial_ph']:.1f}",
-                "9.5",
-                "7.0",
-                date.today().strftime("%Y-%m-%d")
-            ]
-        }
+        st.caption(f"Design Date: {design_date}")
         
         # Display design parameters table
-        st.table(pd.DataFrame(design_params))
+        st.dataframe(design_params_df(*params_args), hide_index=True)
         
         st.subheader("Design Details")
-        design_details = {
-            "Parameter": [
-                "COD Load",
-                "Ozone Requirement",
-                "Ozone Requirement per COD",
-                "Required Filter Area",
-                "Filtration Loading Rate",
-                "Peak Flow Rate"
-            ],
-            "Value": [
-                f"{design_values['cod_load_kg_per_day']:.2f} kg/day",
-                f"{design_values['ozone_requirement_kg_per_day']:.2f} kg/day",
-                "0.25 g O₃/g COD",
-                f"{required_filter_area:.2f} m²",
-                "10 m³/m²/hour",
-                f"{design_values['total_pump_flow_rate']:.2f} m³/hour"
-            ]
-        }
-        
         # Display design details table
-        st.table(pd.DataFrame(design_details))
+        st.dataframe(design_details_df(*details_args), hide_index=True)
     
     with section2:
         st.subheader("Reactor & Reactor Train Details")
         
-        reactor_details = {
-            "Parameter": [
-                "AOP Reactor Size",
-                "AOP Reactors per Train",
-                "Reactor Trains Required",
-                "Total AOP Reactors",
-                "Total Ozone Generators",
-                "Ozone Generator Capacity",
-                "Total Ozone Generation Capacity"
-            ],
-            "Value": [
-                f"{design_values['reactor_size']:.1f} m³",
-                f"{design_values['stages_needed']}",
-                f"{design_values['num_reactor_trains']}",
-                f"{design_values['total_reactors']}",
-                f"{design_values['num_ozone_generators']}",
-                "200 g/hour per generator",
-                f"{design_values['num_ozone_generators'] * 200:.0f} g/hour"
-            ]
-        }
-        
         # Display reactor details table
-        st.table(pd.DataFrame(reactor_details))
+        st.dataframe(reactor_details_df(*reactor_args), hide_index=True)
         
         st.subheader("Pump & Pump Train Details")
         
-        pump_details = {
-            "Parameter": [
-                "Influent Pumps",
-                "Effluent Pumps",
-                "Recirculation Pumps",
-                "Total Pumps",
-                "Pump Flow Rate (per train)",
-                "Total Influent/Effluent Pump Capacity",
-                "Recirculation Flow Rate",
-            ],
-            "Value": [
-                f"{design_values['num_reactor_trains'] * 2} (1 running, 1 standby per train)",
-                f"{design_values['num_reactor_trains'] * 2} (1 running, 1 standby per train)",
-                f"{design_values['recirculation_pumps_required']} (1 running, 1 standby)",
-                f"{design_values['total_pumps']}",
-                f"{design_values['pump_flow_rate_per_train']:.2f} m³/hour",
-                f"{design_values['total_pump_flow_rate']:.2f} m³/hour",
-                f"{design_values['recirculation_flow_rate']:.2f} m³/hour",
-            ]
-        }
-        
         # Display pump details table
-        st.table(pd.DataFrame(pump_details))
+        st.dataframe(pump_details_df(*pump_args), hide_index=True)
     
     # COD Reduction Stages 
     st.subheader("COD Reduction Stages")
-    cod_data = pd.DataFrame({
-        "Stage": [f"Stage {i}" if i > 0 else "Inlet" for i in range(len(design_values['cod_reduction_stages']))],
-        "COD (ppm)": [f"{cod:.2f}" for cod in design_values['cod_reduction_stages']],
-        "Reduction (%)": ["0%"] + [f"{100 * (1 - design_values['cod_reduction_stages'][i]/design_values['cod_reduction_stages'][i-1]):.1f}%" 
-                                   for i in range(1, len(design_values['cod_reduction_stages']))]
-    })
-    st.table(cod_data)
+    cod_data = cod_stage_df(dv.cod_inlet, dv.cod_target)
+    st.dataframe(cod_data, hide_index=True)
     
     # System Schematic with recirculation
     st.subheader("System Schematic")
     
-    schematic = """
-    Raw Wastewater → pH Adjustment (to 9.5) → AOP Reactor Trains → Sand Filtration → pH Adjustment (to 7.0) → Treated Effluent
-                                                |       ↑
-                                                v       |
-                                            Each train: |
-                                            [AOP 1] → [AOP 2] → ... → [AOP n]
-                                                ↑_______|_______↓
-                                                    Recirculation
-    """
-    
-    st.code(schematic)
+    st.code(SCHEMATIC)
     
     st.subheader("Notes and Assumptions")
-    st.write("""
-    1. COD reduction per stage is assumed to be 60% (remaining COD is 40% of original).
-    2. Ozone requirement is calculated at 0.25g O3 per 1g COD.
-    3. Each AOP reactor is equipped with 2 ozone generators (200g O3/hour each).
-    4. Each reactor train has a minimum of 2 and maximum of 4 reactors in series.
-    5. Pump sizing assumes 15-minute fill/drain time for each reactor.
-    6. The design includes 100% standby capacity for all pumps.
-    7. Recirculation pumps continuously circulate water through the AOP reactors at a rate of 5× the total reactor volume every 2 hours.
-    8. Filtration design uses standard loading rates for sand filtration.
-    9. pH adjustment systems are sized based on typical chemical dosing requirements.
-    """)
+    st.markdown(DESIGN_ASSUMPTIONS_NOTE)
     
     # Download button for CSV
-    # Create a combined dataframe for download
-    combined_data = pd.concat([
-        pd.DataFrame(design_params),
-        pd.DataFrame(design_details),
-        pd.DataFrame(reactor_details),
-        pd.DataFrame(pump_details)
-    ]).reset_index(drop=True)
-    
-    def convert_df_to_csv(df):
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        return output.getvalue()
-    
-    csv = convert_df_to_csv(combined_data)
+    # The encoded CSV is kept in session_state and only rebuilt when the tables' inputs change
+    summary_csv_key = (params_args, details_args, reactor_args, pump_args, design_date)
+    if st.session_state.get("summary_csv_key") != summary_csv_key:
+        combined_data = design_summary_df(*summary_csv_key)
+        st.session_state["summary_csv"] = convert_df_to_csv(combined_data)
+        st.session_state["summary_csv_key"] = summary_csv_key
     
     st.download_button(
         label="Download Complete Design Summary as CSV",
-        data=csv,
+        data=st.session_state["summary_csv"],
         file_name="wastewater_treatment_complete_design_summary.csv",
         mime="text/csv",
     )
 
+
 # Tab 7: CAPEX & OPEX
-with tab7:
+def render_capex_opex(dv, rates):
+    capex_items = dv.capex_items
+    opex_items = dv.opex_items
+    php_costs = dv.php_costs
+    php_conversion_rate = dv.php_conversion_rate
+    php_total_capex = php_costs['total_capex']
+    php_annual_opex = php_costs['annual_opex']
+    total_capex = dv.total_capex
+    total_monthly_opex = dv.total_monthly_opex
+    
+    # Item costs in USD and PHP, converted once and reused by the tables, charts and CSV
+    capex_usd = np.fromiter(capex_items.values(), dtype=np.float64, count=len(capex_items))
+    opex_usd = np.fromiter(opex_items.values(), dtype=np.float64, count=len(opex_items))
+    capex_php = capex_usd * php_conversion_rate
+    opex_php = opex_usd * php_conversion_rate
+    
     st.header("CAPEX & OPEX Summary")
     
     # Create two columns for CAPEX and OPEX
@@ -841,54 +1097,63 @@ with tab7:
     with col1:
         st.subheader("Capital Expenditure (CAPEX)")
         
-        # Display metrics for each CAPEX item in PHP
-        for item, cost in capex_items.items():
-            php_cost = cost * php_conversion_rate
-            st.metric(item, f"₱{php_cost:,.2f}", f"{cost/design_values['total_capex']*100:.1f}%")
+        # CAPEX items in PHP as one table rather than a metric per item
+        st.dataframe(pd.DataFrame({
+            "Item": list(capex_items),
+            "Cost (PHP)": [fmt_php(cost) for cost in capex_php.tolist()],
+            "Share %": np.char.mod("%.1f%%", capex_usd / total_capex * 100)
+        }), hide_index=True)
         
-        php_total_capex = design_values['total_capex'] * php_conversion_rate
-        st.metric("Total CAPEX", f"₱{php_total_capex:,.2f}", f"(${design_values['total_capex']:,.2f} USD)")
+        st.metric("Total CAPEX", fmt_php(php_total_capex), f"(${total_capex:,.2f} USD)")
         
         # CAPEX visualization
         st.write("### CAPEX Breakdown")
-        capex_df = pd.DataFrame({
-            'Component': list(capex_items.keys()),
-            'Cost (PHP)': [cost * php_conversion_rate for cost in capex_items.values()]
-        })
-        st.bar_chart(capex_df.set_index('Component'))
+        st.altair_chart(cost_bar_chart(tuple(capex_items), tuple(capex_php.tolist())))
     
     with col2:
         st.subheader("Operational Expenditure (OPEX)")
         
-        # Display metrics for each OPEX item in PHP
-        for item, cost in opex_items.items():
-            php_cost = cost * php_conversion_rate
-            st.metric(item, f"₱{php_cost:,.2f}", f"{cost/design_values['total_monthly_opex']*100:.1f}%")
+        # OPEX items in PHP as one table rather than a metric per item
+        st.dataframe(pd.DataFrame({
+            "Item": list(opex_items),
+            "Cost (PHP)": [fmt_php(cost) for cost in opex_php.tolist()],
+            "Share %": np.char.mod("%.1f%%", opex_usd / total_monthly_opex * 100)
+        }), hide_index=True)
         
-        php_total_monthly_opex = design_values['total_monthly_opex'] * php_conversion_rate
-        st.metric("Total Monthly OPEX", f"₱{php_total_monthly_opex:,.2f}", f"(${design_values['total_monthly_opex']:,.2f} USD)")
-        php_annual_opex = design_values['total_monthly_opex'] * 12 * php_conversion_rate
-        st.metric("Estimated Annual OPEX", f"₱{php_annual_opex:,.2f}", f"(${design_values['total_monthly_opex']*12:,.2f} USD)")
+        st.metric("Total Monthly OPEX", fmt_php(php_costs['total_monthly_opex']), f"(${total_monthly_opex:,.2f} USD)")
+        st.metric("Estimated Annual OPEX", fmt_php(php_annual_opex), f"(${total_monthly_opex*12:,.2f} USD)")
         
         # OPEX visualization
         st.write("### Monthly OPEX Breakdown")
-        opex_df = pd.DataFrame({
-            'Component': list(opex_items.keys()),
-            'Cost (PHP)': [cost * php_conversion_rate for cost in opex_items.values()]
-        })
-        st.bar_chart(opex_df.set_index('Component'))
+        st.altair_chart(cost_bar_chart(tuple(opex_items), tuple(opex_php.tolist())))
+    
+    # Everything below the breakdowns depends on the years-of-operation slider
+    render_financial_analysis(dv, rates, capex_php, opex_php)
+
+# Tab 7 (continued): financial analysis and cost CSV. As a fragment, moving the
+# years-of-operation slider reruns only this part instead of the whole script.
+@st.fragment
+def render_financial_analysis(dv, rates, capex_php, opex_php):
+    capex_items = dv.capex_items
+    opex_items = dv.opex_items
+    php_costs = dv.php_costs
+    flowrate = dv.flowrate
+    php_conversion_rate = dv.php_conversion_rate
+    php_total_capex = php_costs['total_capex']
+    php_annual_opex = php_costs['annual_opex']
+    total_capex = dv.total_capex
+    total_monthly_opex = dv.total_monthly_opex
     
     # Financial analysis section
     st.subheader("Financial Analysis")
     
     # Simple payback and ROI analysis
-    years_of_operation = st.slider("Years of Operation", min_value=1, max_value=20, value=10)
-    annual_opex = design_values['total_monthly_opex'] * 12
+    years_of_operation = st.slider("Years of Operation", min_value=1, max_value=20, key="years_of_operation")
+    annual_opex = total_monthly_opex * 12
     total_opex_over_lifetime = annual_opex * years_of_operation
-    total_cost_over_lifetime = design_values['total_capex'] * 1.232 + total_opex_over_lifetime
+    total_cost_over_lifetime = total_capex * DESIGN.lifetime_capex_factor + total_opex_over_lifetime
     
     # Convert to PHP
-    php_annual_opex = annual_opex * php_conversion_rate
     php_total_opex_over_lifetime = total_opex_over_lifetime * php_conversion_rate
     php_total_cost_over_lifetime = total_cost_over_lifetime * php_conversion_rate
     
@@ -896,44 +1161,44 @@ with tab7:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Cost of Sales", f"₱{php_total_capex:,.2f}", f"(${design_values['total_capex']:,.2f} USD)")
+        st.metric("Cost of Sales", fmt_php(php_total_capex), f"(${total_capex:,.2f} USD)")
     with col2:
-        st.metric(f"Total OPEX ({years_of_operation} years)", f"₱{php_total_opex_over_lifetime:,.2f}", f"(${total_opex_over_lifetime:,.2f} USD)")
+        st.metric(f"Total OPEX ({years_of_operation} years)", fmt_php(php_total_opex_over_lifetime), f"(${total_opex_over_lifetime:,.2f} USD)")
     with col3:
-        st.metric(f"Total Expenditure (TotEx) ({years_of_operation} years)", f"₱{php_total_cost_over_lifetime:,.2f}", f"(${total_cost_over_lifetime:,.2f} USD)")
+        st.metric(f"Total Expenditure (TotEx) ({years_of_operation} years)", fmt_php(php_total_cost_over_lifetime), f"(${total_cost_over_lifetime:,.2f} USD)")
         
     st.header("Margin Analysis")
     col7, col8, col9 = st.columns(3)
     
     with col7:
-        st.metric("EPC Margin", f"₱{design_values['epc_cost'] * php_conversion_rate:,.2f}", f"(${design_values['total_capex'] * 0.1:,.2f} USD)")
+        st.metric("EPC Margin", fmt_php(php_costs['epc_cost']), f"(${total_capex * DESIGN.contingency_rate:,.2f} USD)")
     with col8:
-        st.metric("Contingency", f"₱{php_total_capex * 0.1:,.2f}", f"(${design_values['total_capex'] * 0.1:,.2f} USD)")
+        st.metric("Contingency", fmt_php(php_costs['contingency']), f"(${total_capex * DESIGN.contingency_rate:,.2f} USD)")
     with col9:
-        st.metric("EPC + Contingency", f"₱{design_values['epc_cost'] * php_conversion_rate + php_total_capex * 0.1:,.2f}", f"(${design_values['total_capex'] * 1.1 * 0.12:.2f} USD)")
+        st.metric("EPC + Contingency", fmt_php(php_costs['epc_cost'] + php_costs['contingency']), f"(${total_capex * (1 + DESIGN.contingency_rate) * DESIGN.tax_rate:.2f} USD)")
     
     st.header("Bid Price Analysis")
     col4, col5, col6 = st.columns(3)
     
     with col4:
-        st.metric("Tax", f"₱{php_total_capex * 1.1 * 0.12:,.2f}", f"(${design_values['total_capex'] * 1.1 * 0.12:,.2f} USD)")
+        st.metric("Tax", fmt_php(php_costs['tax']), f"(${total_capex * (1 + DESIGN.contingency_rate) * DESIGN.tax_rate:,.2f} USD)")
     with col6:
-        st.metric("Total Bid Price + Tax & Contingency", f"₱{php_total_capex + php_total_capex * 1.1 * 0.12 + php_total_capex * 0.1:,.2f}", f"(${design_values['total_capex']:,.2f} USD)")
+        st.metric("Total Bid Price + Tax & Contingency", fmt_php(php_costs['total_bid_price']), f"(${total_capex:,.2f} USD)")
         
     
     # Calculate cost per cubic meter treated
-    total_volume_treated = design_values['flowrate'] * 365 * years_of_operation
+    total_volume_treated = flowrate * 365 * years_of_operation
     cost_per_cubic_meter = total_cost_over_lifetime / total_volume_treated
     php_cost_per_cubic_meter = cost_per_cubic_meter * php_conversion_rate
     
     st.header("OpEx Analysis")
     col10, col11, col12 = st.columns(3)
     with col10:
-        st.metric("ToTEx-based Cost Per Cubic Meter Treated", f"₱{php_cost_per_cubic_meter:.2f}/m³", f"(${cost_per_cubic_meter:.2f}/m³ of wastewater)")
+        st.metric("ToTEx-based Cost Per Cubic Meter Treated", fmt_php(php_cost_per_cubic_meter, grouping=False) + "/m³", f"(${cost_per_cubic_meter:.2f}/m³ of wastewater)")
     with col11:
-        st.metric("ToTEx-based Cost Per Liter Treated", f"₱{php_cost_per_cubic_meter / 1000:.2f}/L", f"(${cost_per_cubic_meter:.2f}/m³ of wastewater)")
+        st.metric("ToTEx-based Cost Per Liter Treated", fmt_php(php_cost_per_cubic_meter / 1000, grouping=False) + "/L", f"(${cost_per_cubic_meter:.2f}/m³ of wastewater)")
     with col12:
-        st.metric("OpEx-based Cost Per Liter Treated", f"₱{php_annual_opex / 365 / flowrate / 1000:.2f}/L", f"(${php_annual_opex / 365 / flowrate / php_conversion_rate:.2f}/m³ of wastewater)")
+        st.metric("OpEx-based Cost Per Liter Treated", fmt_php(php_annual_opex / 365 / flowrate / 1000, grouping=False) + "/L", f"(${php_annual_opex / 365 / flowrate / php_conversion_rate:.2f}/m³ of wastewater)")
     
     st.subheader("Cost Assumptions")
     
@@ -941,66 +1206,83 @@ with tab7:
     col1, col2 = st.columns(2)
     
     with col1:
-        st.write("### Unit Costs")
-        st.write(f"- AOP Reactor: ${aop_reactor_unit_cost:.2f} per reactor")
-        st.write(f"- Ozone Generator: ${ozone_generator_unit_cost:.2f} per unit")
-        st.write(f"- Pump: ${pump_unit_cost:.2f} per pump")
-        st.write(f"- Sand Filtration: ${filter_unit_cost:.2f} per filter unit")
-        st.write(f"- Electricity Cost: {design_values['electricity_cost'] * php_conversion_rate:.2f} Pesos per kWh")
-        st.write(f"- Chemical Cost Factor: {design_values['chemical_cost_factor']:.1f}")
+        st.markdown("\n".join([
+            "### Unit Costs",
+            f"- AOP Reactor: ${rates['aop_reactor_unit_cost']:.2f} per reactor",
+            f"- Ozone Generator: ${rates['ozone_generator_unit_cost']:.2f} per unit",
+            f"- Pump: ${rates['pump_unit_cost']:.2f} per pump",
+            f"- Sand Filtration: ${rates['filter_unit_cost']:.2f} per filter unit",
+            f"- Electricity Cost: {dv.electricity_cost * php_conversion_rate:.2f} Pesos per kWh",
+            f"- Chemical Cost Factor: {dv.chemical_cost_factor:.1f}"
+        ]))
         
     with col2:
-        st.write("### Operational Parameters")
-        st.write(f"- Ozone Power: {ozone_power_consumption:.1f} kWh per kg O₃")
-        st.write(f"- Pumping Power: {pump_power_consumption:.2f} kWh per m³")
-        st.write(f"- Chemical Cost: {chemicals_base_cost * php_conversion_rate:.2f} Pesos per m³ treated")
-        st.write(f"- Operators Required: {design_values['operators_required']}")
-        st.write(f"- Operator Salary: {operator_monthly_salary * php_conversion_rate:,.2f} Pesos per operator per month")
-        st.write(f"- Maintenance: {maintenance_factor:.1f}% of CAPEX per year")
+        st.markdown("\n".join([
+            "### Operational Parameters",
+            f"- Ozone Power: {rates['ozone_power_consumption']:.1f} kWh per kg O₃",
+            f"- Pumping Power: {rates['pump_power_consumption']:.2f} kWh per m³",
+            f"- Chemical Cost: {rates['chemicals_base_cost'] * php_conversion_rate:.2f} Pesos per m³ treated",
+            f"- Operators Required: {dv.operators_required}",
+            f"- Operator Salary: {rates['operator_monthly_salary'] * php_conversion_rate:,.2f} Pesos per operator per month",
+            f"- Maintenance: {rates['maintenance_factor']:.1f}% of CAPEX per year"
+        ]))
     
     # Download detailed cost breakdown
     st.subheader("Download Detailed Cost Analysis")
     
-    # Create detailed cost DataFrame
-    detailed_cost_data = {
-        "Component": list(capex_items.keys()) + ["Total CAPEX"] + list(opex_items.keys()) + ["Total Monthly OPEX", "Annual OPEX", f"Lifetime OPEX ({years_of_operation} years)", f"Total Lifetime Cost ({years_of_operation} years)", "Cost Per Cubic Meter"],
-        "Cost (PHP)": [value * php_conversion_rate for value in capex_items.values()] + [design_values['total_capex'] * php_conversion_rate] + [value * php_conversion_rate for value in opex_items.values()] + [design_values['total_monthly_opex'] * php_conversion_rate, annual_opex * php_conversion_rate, total_opex_over_lifetime * php_conversion_rate, total_cost_over_lifetime * php_conversion_rate, cost_per_cubic_meter * php_conversion_rate],
-        "Category": ["CAPEX"]*len(capex_items) + ["CAPEX"] + ["Monthly OPEX"]*len(opex_items) + ["Monthly OPEX", "Annual OPEX", "Lifetime OPEX", "Total Cost", "Unit Cost"]
-    }
-    
-    # Create notes list with the correct length
-    notes = []
-    # Add notes for CAPEX items
-    notes.extend(["AOP reactor cost", "Ozone generator cost", "Pumping equipment cost", 
-                 "Sand filtration system", "pH adjustment system", "Container Housing", 
-                 "Piping and instrumentation", "Engineering, procurement, and construction"])
-    # Add note for Total CAPEX
-    notes.append("Total capital expenditure")
-    # Add notes for OPEX items
-    notes.extend(["Power for ozone generation", "Power for pumping", "Chemical costs for pH adjustment", 
-                 "Staff costs", "Parts and consumables"])
-    # Add remaining notes
-    notes.extend(["Total monthly operational cost", "Annual operational cost", 
-                f"Operational cost over {years_of_operation} years", 
-                f"Total cost over {years_of_operation} years", 
-                "Cost per cubic meter of water treated"])
-    
-    # Add notes to the dictionary
-    detailed_cost_data["Notes"] = notes
-    
-    # Now create the DataFrame
-    detailed_cost_df = pd.DataFrame(detailed_cost_data)
-    
-    # Prepare CSV download
-    cost_csv = convert_df_to_csv(detailed_cost_df)
+    # The encoded CSV is kept in session_state and only rebuilt when its inputs change
+    cost_csv_key = (years_of_operation, php_conversion_rate, flowrate, total_capex, total_monthly_opex, tuple(capex_php.tolist()), tuple(opex_php.tolist()))
+    if st.session_state.get("cost_csv_key") != cost_csv_key:
+        # Create detailed cost DataFrame
+        summary_usd = np.array([total_monthly_opex, annual_opex, total_opex_over_lifetime, total_cost_over_lifetime, cost_per_cubic_meter])
+        detailed_cost_data = {
+            "Component": (*capex_items, "Total CAPEX", *opex_items, "Total Monthly OPEX", "Annual OPEX", f"Lifetime OPEX ({years_of_operation} years)", f"Total Lifetime Cost ({years_of_operation} years)", "Cost Per Cubic Meter"),
+            "Cost (PHP)": np.concatenate([capex_php, [total_capex * php_conversion_rate], opex_php, summary_usd * php_conversion_rate]),
+            "Category": ("CAPEX",) * (len(capex_items) + 1) + ("Monthly OPEX",) * (len(opex_items) + 1) + ("Annual OPEX", "Lifetime OPEX", "Total Cost", "Unit Cost")
+        }
+        
+        # Only the lifetime notes depend on the years of operation
+        assert len(COST_ITEM_NOTES) == len(capex_items) + 1 + len(opex_items)
+        notes = list(COST_ITEM_NOTES) + [
+            "Total monthly operational cost", "Annual operational cost",
+            f"Operational cost over {years_of_operation} years",
+            f"Total cost over {years_of_operation} years",
+            "Cost per cubic meter of water treated"
+        ]
+        
+        # Add notes to the dictionary
+        detailed_cost_data["Notes"] = notes
+        
+        # Now create the DataFrame
+        detailed_cost_df = pd.DataFrame(detailed_cost_data)
+        
+        # Prepare CSV download
+        st.session_state["cost_csv"] = convert_df_to_csv(detailed_cost_df)
+        st.session_state["cost_csv_key"] = cost_csv_key
     
     st.download_button(
         label="Download Detailed Cost Analysis as CSV",
-        data=cost_csv,
+        data=st.session_state["cost_csv"],
         file_name="wastewater_treatment_cost_analysis.csv",
         mime="text/csv",
     )
 
+# Render the selected view
+if active_tab == "AOP Summary":
+    render_summary(design_values)
+elif active_tab == "Wastewater Conveyance":
+    render_conveyance(design_values)
+elif active_tab == "Filtration Requirements":
+    render_filtration(design_values)
+elif active_tab == "pH Adjustment":
+    render_ph_adjustment(design_values)
+elif active_tab == "Standard Rates":
+    render_standard_rates(params.php_conversion_rate)
+elif active_tab == "Full Design Summary":
+    render_design_summary(design_values)
+elif active_tab == "CAPEX & OPEX":
+    render_capex_opex(design_values, rates)
+
 # Add a footer
 st.markdown("---")
 st.markdown("© 2025 ECH2O Advanced Oxidation Process Design Dashboard | Created: April 2025")